@@ -1,153 +1,368 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
 from datetime import datetime, timedelta
 import requests
+import httpx
 from bs4 import BeautifulSoup
 import re
+import asyncio
 from typing import Optional
 import logging
-from playwright.async_api import async_playwright
+from functools import lru_cache
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from cachetools import TTLCache
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 import os  # Add os import for PORT
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Launch one Chromium instance for the lifetime of the app; requests only open contexts"""
+    playwright = await async_playwright().start()
+    app.state.playwright = playwright
+    app.state.browser = None
+    app.state.browser_lock = asyncio.Lock()
+    try:
+        app.state.browser = await playwright.chromium.launch()
+        yield
+    finally:
+        if app.state.browser:
+            await app.state.browser.close()
+        await playwright.stop()
+
+async def get_browser(app: FastAPI):
+    """Return the shared browser, relaunching Chromium if it crashed or disconnected"""
+    async with app.state.browser_lock:
+        if not app.state.browser.is_connected():
+            logger.warning("Browser disconnected, relaunching Chromium")
+            app.state.browser = await app.state.playwright.chromium.launch()
+    return app.state.browser
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Placeholder for future politician mapping table
 POLITICIAN_MAPPING = {
     "Nancy Pelosi": "P000197"
 }
 
+# JSON backend behind the Capitol Trades frontend; much cheaper than rendering the page
+BFF_URL = "https://bff.capitoltrades.com/trades"
+BFF_PAGE_SIZE = 96
+# Kept short so a dead endpoint adds little before the Playwright fallback runs
+BFF_TIMEOUT = 5
+
+# Scraped rows are reused for this many seconds; date/type filters are applied per request
+ROWS_CACHE_TTL = 60
+_rows_cache = TTLCache(maxsize=256, ttl=ROWS_CACHE_TTL)
+
+# After a JSON backend failure, go straight to Playwright for this many seconds
+BFF_FAILURE_TTL = 300
+_bff_failures = TTLCache(maxsize=1, ttl=BFF_FAILURE_TTL)
+
+# Number of browser pages used in parallel to hover transaction tooltips
+HOVER_WORKERS = 5
+# Milliseconds to wait for a transaction cell to become hoverable before giving up on its row
+HOVER_TIMEOUT = 2000
+
+# Resource types not needed to read the trades table; skipping them speeds up page loads.
+# Stylesheets stay enabled: tooltip visibility and hover targets depend on the page's CSS
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# Elements Capitol Trades may use to render the transaction description tooltip
+TOOLTIP_SELECTOR = ".q-tooltip, [role='tooltip'], [data-tooltip], .tooltip, .popover"
+
+# Precompiled patterns used on every parsed row
+_SENATOR_INFO_RE = re.compile(r'^.*?(Democrat|Republican|Independent)?\s*(Senate|House)?\s*([A-Z]{2})?$', re.DOTALL)
+_TICKER_RE = re.compile(r'([A-Z]+:US)$')
+_WS_RE = re.compile(r'\s+')
+_DATE_RE = re.compile(r'^\s*(\d{1,2})\s*([A-Za-z]+)\s*(\d{4})\s*$')
+
+# Month names and abbreviations as they appear on Capitol Trades (e.g., "Sept")
+_MONTHS = {
+    "jan": 1, "january": 1,
+    "feb": 2, "february": 2,
+    "mar": 3, "march": 3,
+    "apr": 4, "april": 4,
+    "may": 5,
+    "jun": 6, "june": 6,
+    "jul": 7, "july": 7,
+    "aug": 8, "august": 8,
+    "sep": 9, "sept": 9, "september": 9,
+    "oct": 10, "october": 10,
+    "nov": 11, "november": 11,
+    "dec": 12, "december": 12,
+}
+
+# Parsed trade row; slotted to keep per-row memory small, serialized directly by orjson
+# (explicit __slots__ since dataclass(slots=True) needs Python 3.10 and the image runs 3.9)
+@dataclass
+class Trade:
+    __slots__ = (
+        "publish_date", "trade_date", "senator_name", "senator_info", "type", "size",
+        "issuer_trade", "ticker", "days_filed_after", "owner", "price", "description"
+    )
+    publish_date: str
+    trade_date: str
+    senator_name: str
+    senator_info: str
+    type: str
+    size: str
+    issuer_trade: str
+    ticker: str
+    days_filed_after: str
+    owner: str
+    price: str
+    description: str
+
 # Helper function to clean text
 def clean_text(text: str) -> str:
     if not text:
         return ""
-    return ' '.join(text.strip().split())
+    return _WS_RE.sub(' ', text).strip()
 
 # Helper function to parse senator info (e.g., "Nancy PelosiDemocratHouseCA" -> Democrat, House, CA)
+# Memoized since every row for the same politician carries the same info string
+@lru_cache(maxsize=4096)
 def parse_senator_info(info: str) -> str:
     if not info:
         return "Unknown, Unknown, Unknown"
     
-    party = "Unknown"
-    branch = "Unknown"
-    state = "Unknown"
-    
-    info = info.strip()
+    # Party, branch and state trail the name (e.g., "...DemocratHouseCA"), so one match picks up all three
+    party, branch, state = _SENATOR_INFO_RE.match(info.strip()).groups()
     
-    if "Democrat" in info:
-        party = "Democrat"
-    elif "Republican" in info:
-        party = "Republican"
-    elif "Independent" in info:
-        party = "Independent"
-        
-    if "Senate" in info:
-        branch = "Senate"
-    elif "House" in info:
-        branch = "House"
-        
-    state_match = re.search(r'[A-Z]{2}$', info)
-    if state_match:
-        state = state_match.group()
-    
-    return f"{party}, {branch}, {state}"
+    return f"{party or 'Unknown'}, {branch or 'Unknown'}, {state or 'Unknown'}"
 
-# Helper function to parse date strings (e.g., "20 Jun2025", "12 Sept2024")
+# Helper function to parse date strings (e.g., "20 Jun2025", "12 Sept2024", "10 Jul 2025")
+# Memoized since rows in a batch share the same few publish/trade dates
+@lru_cache(maxsize=4096)
 def parse_date(date_str: str) -> Optional[datetime]:
     if not date_str:
-        logger.debug(f"Empty date string")
+        logger.debug("Empty date string")
         return None
     
-    # Normalize month abbreviations (e.g., "Sept" -> "Sep")
-    month_mappings = {
-        "Sept": "Sep",
-  
-    }
-    normalized_date = date_str.strip()
-    for wrong, right in month_mappings.items():
-        normalized_date = normalized_date.replace(wrong, right)
-    
-    logger.debug(f"Normalized date: '{date_str}' -> '{normalized_date}'")
+    match = _DATE_RE.match(date_str)
+    if match:
+        month = _MONTHS.get(match.group(2).lower())
+        if month:
+            try:
+                return datetime(int(match.group(3)), month, int(match.group(1)))
+            except ValueError:
+                pass
     
-    formats = ["%d %b %Y","%d %b%Y", "%d %B %Y"]
+    # Fall back to strptime for anything the fast path doesn't recognise
+    normalized_date = date_str.strip()
+    formats = ["%d %b %Y", "%d %b%Y", "%d %B %Y"]
     for fmt in formats:
         try:
             return datetime.strptime(normalized_date, fmt)
         except (ValueError, TypeError):
             continue
-    logger.debug(f"Failed to parse normalized date '{normalized_date}' with formats {formats}")
+    logger.debug("Failed to parse date '%s' with formats %s", date_str, formats)
     return None
 
 # Helper function to determine asset type
 def is_valid_asset(ticker: str, include_stock: bool, include_option: bool) -> bool:
     return include_stock  # Assume all are stocks, as debug data shows only :US tickers
 
+# Collects the text of every cell (plus the row HTML when asked) for all trade rows in one evaluate call
+_EXTRACT_ROWS_JS = """(captureHtml) => Array.from(document.querySelectorAll('tbody tr')).map(r => ({
+    cells: Array.from(r.querySelectorAll('td')).map(td => td.innerText),
+    classes: r.className,
+    html: captureHtml ? r.innerHTML : null
+}))"""
+
 @app.get("/")
 async def root():
     return {"message": "Capitol Trades API is running"}
 
-async def fetch_page_content(base_url: str, params: dict) -> tuple[str, list]:
-    """Fetch page content and extract rows with Playwright Async"""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
+async def block_heavy_resources(route):
+    """Abort requests for assets the scraper never looks at"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def open_trades_page(context, url: str, require_rows: bool = False):
+    """Open a new page on the given URL and wait for the trades table to render.
+    With require_rows, a table that never renders raises instead of returning an empty page."""
+    page = await context.new_page()
+    await page.goto(url, wait_until="domcontentloaded")
+    try:
+        await page.wait_for_selector("tbody tr", timeout=60000)
+    except PlaywrightTimeoutError:
+        if require_rows:
+            raise
+        logger.warning(f"No 'tbody tr' rendered on {url}")
+    return page
+
+async def fetch_descriptions(page, row_indices: list) -> dict:
+    """Hover the transaction cell of each given row and collect the tooltip text"""
+    trade_rows = page.locator("tbody tr")
+    descriptions = {}
+    for i in row_indices:
+        description = ""
+        try:
+            tx_cell = trade_rows.nth(i).locator("td").nth(6)  # Transaction type (e.g., "buy")
+            await tx_cell.hover(timeout=HOVER_TIMEOUT)
+            try:
+                # Returns as soon as the tooltip is shown instead of sleeping a fixed delay
+                tooltip = await page.wait_for_selector(TOOLTIP_SELECTOR, state="visible", timeout=800)
+            except PlaywrightTimeoutError:
+                tooltip = None
+            if tooltip:
+                description = await tooltip.inner_text()
+                description = clean_text(description)
+                logger.debug("Row %d: Description extracted: %s", i, description)
+                # Let this tooltip hide before the next hover, otherwise the next row would pick it up
+                await page.mouse.move(0, 0)
+                try:
+                    await tooltip.wait_for_element_state("hidden", timeout=800)
+                except PlaywrightTimeoutError:
+                    logger.debug("Row %d: Tooltip still visible after moving the mouse away", i)
+            else:
+                logger.debug("Row %d: No tooltip found for transaction cell", i)
+        except Exception as e:
+            logger.debug("Row %d: Failed to extract description: %s", i, e)
+        descriptions[i] = description
+    return descriptions
+
+async def fetch_page_content(app: FastAPI, base_url: str, params: dict, capture_html: bool = False) -> tuple[str, list]:
+    """Fetch page content and extract rows with Playwright Async using the app's shared browser.
+    Row HTML is only captured (as "raw_html") when capture_html is set, e.g. for /debug."""
+    browser = await get_browser(app)
+    context = await browser.new_context()
+    await context.route("**/*", block_heavy_resources)
+    try:
         url = f"{base_url}?{'&'.join(f'{k}={v}' for k, v in params.items())}"
         logger.info(f"Navigating to: {url}")
-        await page.goto(url)
-        await page.wait_for_load_state("networkidle", timeout=60000)
+        page = await open_trades_page(context, url)
 
-        # Find trade rows
-        trade_rows = await page.query_selector_all("tbody tr")
-        logger.info(f"Found {len(trade_rows)} rows with selector 'tbody tr'")
+        # Extract every row's cell texts and HTML in a single round-trip to the browser
+        raw_rows = await page.evaluate(_EXTRACT_ROWS_JS, capture_html)
+        logger.info(f"Found {len(raw_rows)} rows with selector 'tbody tr'")
         
-        rows_data = []
-        for i, row in enumerate(trade_rows):  # Skip header
-            # Get cells
-            cells = await row.query_selector_all("td")
-            logger.debug(f"Row {i}: Found {len(cells)} cells")
-            if len(cells) < 10:
-                logger.debug(f"Row {i}: Skipped, only {len(cells)} cells found, expected 10")
+        row_indices = []
+        for i, raw_row in enumerate(raw_rows):
+            cell_count = len(raw_row["cells"])
+            logger.debug("Row %d: Found %d cells", i, cell_count)
+            if cell_count < 10:
+                logger.debug("Row %d: Skipped, only %d cells found, expected 10", i, cell_count)
                 continue
-            
-            # Extract description by hovering over transaction type (cell 6)
-            description = ""
-            try:
-                tx_cell = cells[6]  # Transaction type (e.g., "buy")
-                await tx_cell.hover()
-                await page.wait_for_timeout(500)  # Wait for tooltip
-                tooltip = await page.query_selector(".q-tooltip, [role='tooltip'], [data-tooltip], .tooltip, .popover")
-                if tooltip:
-                    description = await tooltip.inner_text()
-                    description = clean_text(description)
-                    logger.debug(f"Row {i}: Description extracted: {description}")
-                else:
-                    logger.debug(f"Row {i}: No tooltip found for transaction cell")
-            except Exception as e:
-                logger.debug(f"Row {i}: Failed to extract description: {str(e)}")
-            
-            # Get cell texts
-            cell_texts = []
-            for cell in cells:
-                text = await cell.inner_text()
-                cell_texts.append(clean_text(text))
-            
-            rows_data.append({
-                "cell_count": len(cells),
-                "cell_contents": cell_texts,
-                "description": description,
-                "raw_html": await row.inner_html()
-            })
+            row_indices.append(i)
+        
+        # Hover tooltips on several pages at once, each page handling its own shard of rows
+        shards = [shard for shard in (row_indices[k::HOVER_WORKERS] for k in range(HOVER_WORKERS)) if shard]
+        extra_pages = await asyncio.gather(
+            *(open_trades_page(context, url, require_rows=True) for _ in shards[1:]),
+            return_exceptions=True
+        )
+        hover_pages, hover_shards = [page], shards[:1]
+        for extra_page, shard in zip(extra_pages, shards[1:]):
+            if isinstance(extra_page, Exception):
+                # Don't lose the rows, hover them on the main page instead
+                logger.warning(f"Failed to open hover page: {str(extra_page)}")
+                hover_shards[0] = hover_shards[0] + shard
+            else:
+                hover_pages.append(extra_page)
+                hover_shards.append(shard)
+        results = await asyncio.gather(*(
+            fetch_descriptions(hover_page, shard)
+            for hover_page, shard in zip(hover_pages, hover_shards)
+        ))
+        descriptions = {}
+        for result in results:
+            descriptions.update(result)
+        
+        rows_data = []
+        for i in row_indices:
+            row_data = {
+                "row_index": i,
+                "classes": raw_rows[i]["classes"].split(),
+                "cell_count": len(raw_rows[i]["cells"]),
+                "cell_contents": [clean_text(text) for text in raw_rows[i]["cells"]],
+                "description": descriptions.get(i, "")
+            }
+            if capture_html:
+                row_data["raw_html"] = raw_rows[i]["html"]
+            rows_data.append(row_data)
 
         content = await page.content()
-        await browser.close()
         logger.info(f"Page content length: {len(content)}")
         logger.debug(f"Page content snippet: {content[:200]}...")
         return content, rows_data
+    finally:
+        await context.close()
+
+# Helper function to format amounts the way the trades table shows them (e.g., 15001 -> "15K")
+# Size bracket bounds look like 1,001 / 15,001 / 1,000,001, so round down to whole units
+def format_amount(value) -> str:
+    if value is None:
+        return ""
+    for divisor, suffix in ((1_000_000, "M"), (1_000, "K")):
+        if value >= divisor:
+            return f"{int(value // divisor)}{suffix}"
+    return f"{int(value)}"
+
+# Helper function to turn one BFF trade record into the same row shape the page scrape produces
+def bff_trade_to_row(item: dict) -> dict:
+    politician = item.get("politician") or {}
+    issuer = item.get("issuer") or {}
+    pub_date = datetime.fromisoformat(item["pubDate"][:10])
+    tx_date = datetime.fromisoformat(item["txDate"][:10])
+    low, high = item.get("sizeRangeLow"), item.get("sizeRangeHigh")
+    price = item.get("price")
+    reporting_gap = item.get("reportingGap")
+    cells = [
+        f"{politician.get('firstName') or ''} {politician.get('lastName') or ''}"
+        f"{(politician.get('party') or '').capitalize()}{(politician.get('chamber') or '').capitalize()}"
+        f"{(politician.get('_stateId') or '').upper()}",
+        f"{issuer.get('issuerName') or ''}{issuer.get('issuerTicker') or ''}",
+        f"{pub_date.day} {pub_date:%b}{pub_date.year}",
+        f"{tx_date.day} {tx_date:%b}{tx_date.year}",
+        f"{'' if reporting_gap is None else reporting_gap}days",
+        (item.get("owner") or "").capitalize(),
+        item.get("txType") or "",
+        f"{format_amount(low)}–{format_amount(high)}" if low is not None and high is not None else "",
+        f"${price:,.2f}" if price is not None else "N/A",
+        "",
+    ]
+    return {
+        "cell_count": len(cells),
+        "cell_contents": cells,
+        "description": clean_text(item.get("comment") or "")
+    }
+
+async def fetch_bff_rows(params: dict) -> list:
+    """Fetch trades from the Capitol Trades JSON backend, shaped like the scraped rows"""
+    bff_params = {**params, "pageSize": BFF_PAGE_SIZE}
+    async with httpx.AsyncClient(timeout=BFF_TIMEOUT) as client:
+        response = await client.get(BFF_URL, params=bff_params)
+        response.raise_for_status()
+        data = response.json()
+    
+    items = data["data"]
+    rows_data = []
+    for i, item in enumerate(items):
+        try:
+            rows_data.append(bff_trade_to_row(item))
+        except Exception as e:
+            logger.warning(f"Error processing BFF trade {i}: {str(e)}. Record: {str(item)[:200]}")
+            continue
+    if not items:
+        raise ValueError("BFF returned no trades")
+    if not rows_data:
+        raise ValueError(f"none of the {len(items)} BFF trades could be mapped")
+    logger.info(f"Fetched {len(rows_data)} trades from {BFF_URL}")
+    return rows_data
 
 @app.get("/trades")
 async def get_trades(
+    request: Request,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     trade_type: str = "both",
@@ -178,40 +393,46 @@ async def get_trades(
         base_url = "https://www.capitoltrades.com/trades"
         params = {"politician": POLITICIAN_MAPPING["Nancy Pelosi"]}
         
-        # Fetch page content and rows
-        content, rows_data = await fetch_page_content(base_url, params)
-        
-        # Parse HTML with BeautifulSoup for fallback
-        soup = BeautifulSoup(content, "html.parser")
-        trade_rows = soup.select("tbody tr")
-        if not trade_rows:
-            logger.warning("No trade rows found with 'tbody tr'. Falling back to all table rows...")
-            tables = soup.find_all("table")
-            for table in tables:
-                rows = table.find_all("tr")
-                trade_rows = [row for row in rows if row.find_all("td")]
-                if trade_rows:
-                    logger.info(f"Fallback: found {len(trade_rows)} rows in table")
-                    break
+        cache_key = (params["politician"],)
+        rows_data = _rows_cache.get(cache_key)
+        if rows_data is not None:
+            logger.debug("Using %d cached rows for %s", len(rows_data), cache_key)
+        else:
+            # Try the JSON backend first (unless it failed recently), falling back to rendering
+            # the page with Playwright
+            if BFF_URL not in _bff_failures:
+                try:
+                    rows_data = await fetch_bff_rows(params)
+                except (httpx.HTTPError, KeyError, TypeError, ValueError) as e:
+                    logger.warning(f"JSON backend unavailable ({str(e)}), skipping it for {BFF_FAILURE_TTL}s")
+                    _bff_failures[BFF_URL] = str(e)
+            if rows_data is None:
+                # The rendered HTML isn't needed here, Playwright already extracted the cells
+                _, rows_data = await fetch_page_content(request.app, base_url, params)
+            if rows_data:
+                _rows_cache[cache_key] = rows_data
         
-        if not trade_rows:
-            logger.warning("No trade rows found in any table.")
+        if not rows_data:
+            logger.warning("No trade rows found with 'tbody tr'.")
             return {
                 "trades": [],
                 "debug_info": "No trade rows found. Check HTML structure in /debug endpoint with use_playwright=true."
             }
 
+        # Years covered by the date range, used to reject rows before parsing their dates
+        years = {str(year) for year in range(start_date_dt.year, end_date_dt.year + 1)}
+
         trades = []
         for i, row_data in enumerate(rows_data, start=0):
+            raw_html = row_data.get("raw_html", "")
             try:
                 cell_count = row_data["cell_count"]
                 cells = row_data["cell_contents"]
                 description = row_data["description"]
-                raw_html = row_data["raw_html"]
                 
-                logger.debug(f"Row {i}: Found {cell_count} cells: {cells[:50]}")
+                logger.debug("Row %d: Found %d cells: %s", i, cell_count, cells[:50])
                 if cell_count < 10:
-                    logger.debug(f"Row {i}: Skipped, only {cell_count} cells found, expected 10. Raw HTML: {raw_html[:200]}")
+                    logger.debug("Row %d: Skipped, only %d cells found, expected 10. Raw HTML: %s", i, cell_count, raw_html[:200])
                     continue
                 
                 # Map cells to fields
@@ -219,9 +440,9 @@ async def get_trades(
                 senator = "Nancy Pelosi"
                 senator_info = parse_senator_info(senator_info_raw)
                 issuer_ticker = cells[1]  # e.g., "Broadcom IncAVGO:US"
-                ticker_match = re.search(r'([A-Z]+:US)$', issuer_ticker)
-                issuer = issuer_ticker.replace(ticker_match.group(0), '').strip() if ticker_match else issuer_ticker
-                ticker = ticker_match.group(0) if ticker_match else ""
+                ticker_match = _TICKER_RE.search(issuer_ticker)
+                issuer = issuer_ticker[:ticker_match.start()].rstrip() if ticker_match else issuer_ticker
+                ticker = ticker_match.group(1) if ticker_match else ""
                 publish_date = cells[2]  # e.g., "10 Jul2025"
                 trade_date = cells[3]  # e.g., "20 Jun2025"
                 days_filed_after = cells[4].replace("days", "").strip()  # e.g., "19"
@@ -231,46 +452,54 @@ async def get_trades(
                 price = cells[8]  # e.g., "$80.00"
                 
                 # Log trade details before filtering
-                logger.debug(f"Row {i}: publish_date={publish_date}, tx_type={tx_type}, ticker={ticker}, description={description}")
+                logger.debug("Row %d: publish_date=%s, tx_type=%s, ticker=%s, description=%s", i, publish_date, tx_type, ticker, description)
+
+                # Dates end with the year (e.g., "10 Jul2025"), so rows from other years can be skipped
+                # without parsing; anything not ending in a year still goes through parse_date below
+                year = publish_date[-4:]
+                if year.isdigit() and year not in years:
+                    logger.debug("Row %d: Skipped, publish_date %s outside years %s", i, publish_date, years)
+                    continue
 
                 # Filter by trade_date (include if parsing fails)
                 publish_date_dt = parse_date(publish_date)
                 if publish_date_dt and (publish_date_dt < start_date_dt or publish_date_dt > end_date_dt):
-                    logger.debug(f"Row {i}: Skipped, publish_date {publish_date} (parsed: {publish_date_dt}) outside range {start_date} to {end_date}")
+                    logger.debug("Row %d: Skipped, publish_date %s (parsed: %s) outside range %s to %s", i, publish_date, publish_date_dt, start_date, end_date)
                     continue
                 
                 # Filter by trade type
                 if trade_type != "both" and tx_type and trade_type.lower() not in tx_type.lower():
-                    logger.debug(f"Row {i}: Skipped, tx_type {tx_type} does not match {trade_type}")
+                    logger.debug("Row %d: Skipped, tx_type %s does not match %s", i, tx_type, trade_type)
                     continue
                 
                 # Filter by asset type
                 if not is_valid_asset(ticker, include_stock, include_option):
-                    logger.debug(f"Row {i}: Skipped, ticker {ticker} does not match asset filter (stock={include_stock}, option={include_option})")
+                    logger.debug("Row %d: Skipped, ticker %s does not match asset filter (stock=%s, option=%s)", i, ticker, include_stock, include_option)
                     continue
 
                 # Add trade
-                trades.append({
-                    "publish_date": publish_date,
-                    "trade_date": trade_date,
-                    "senator_name": senator,
-                    "senator_info": senator_info,
-                    "type": tx_type,
-                    "size": size,
-                    "issuer_trade": issuer,
-                    "ticker": ticker,
-                    "days_filed_after": days_filed_after,
-                    "owner": owner,
-                    "price": price,
-                    "description": description
-                })
+                trades.append(Trade(
+                    publish_date=publish_date,
+                    trade_date=trade_date,
+                    senator_name=senator,
+                    senator_info=senator_info,
+                    type=tx_type,
+                    size=size,
+                    issuer_trade=issuer,
+                    ticker=ticker,
+                    days_filed_after=days_filed_after,
+                    owner=owner,
+                    price=price,
+                    description=description
+                ))
                     
             except Exception as e:
                 logger.warning(f"Error processing row {i}: {str(e)}. Raw HTML: {raw_html[:200]}")
                 continue
 
         logger.info(f"Successfully parsed {len(trades)} trades")
-        return {
+        # Returned as a response directly so orjson serializes the Trade dataclasses itself
+        return ORJSONResponse({
             "trades": trades,
             "total_count": len(trades),
             "date_range": f"{start_date} to {end_date}",
@@ -280,14 +509,115 @@ async def get_trades(
                 "include_stock": include_stock,
                 "include_option": include_option
             }
-        }
+        }, headers={"Cache-Control": f"max-age={ROWS_CACHE_TTL}"})
         
     except Exception as e:
         logger.error(f"Processing error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing data: {str(e)}")
 
+# Helper function to describe an extracted row the same way /debug describes a parsed <tr>
+# (row_index is the row's position among 'tbody tr' rows, including skipped ones)
+def debug_row_info(row_data: dict) -> dict:
+    cells = row_data["cell_contents"]
+    trade_date = cells[3] if len(cells) > 3 else ""
+    trade_date_dt = parse_date(trade_date) if trade_date else None
+    return {
+        "row_index": row_data["row_index"],
+        "classes": row_data["classes"],
+        "cell_count": row_data["cell_count"],
+        "cell_contents": [text[:100] for text in cells],
+        "trade_date": trade_date,
+        "trade_date_parsed": trade_date_dt.isoformat() if trade_date_dt else "None",
+        "description": row_data["description"],
+        "raw_html": row_data.get("raw_html", "")[:200]
+    }
+
+# Helper function yielding /debug table details one table at a time
+def iter_debug_tables(tables: list, rows_data: list):
+    if rows_data:
+        # Playwright already extracted the trade rows, no need to walk the tables again
+        yield {
+            "table_index": 0,
+            "note": "Playwright-extracted 'tbody tr' rows; rows with fewer than 10 cells are excluded",
+            "row_count": len(rows_data),
+            "sample_rows": [debug_row_info(row_data) for row_data in rows_data]
+        }
+        return
+    
+    for i, table in enumerate(tables):
+        rows = table.find_all("tr")
+        sample_rows = []
+        for j, row in enumerate(rows):
+            cells = row.find_all("td")
+            trade_date = clean_text(cells[3].text) if len(cells) > 3 else ""
+            trade_date_dt = parse_date(trade_date) if trade_date else None
+            sample_rows.append({
+                "row_index": j,
+                "classes": row.get('class', []),
+                "cell_count": len(cells),
+                "cell_contents": [clean_text(cell.text)[:100] for cell in cells],
+                "trade_date": trade_date,
+                "trade_date_parsed": trade_date_dt.isoformat() if trade_date_dt else "None",
+                "description": "",
+                "raw_html": str(row)[:200]
+            })
+        yield {
+            "table_index": i,
+            "row_count": len(rows),
+            "sample_rows": sample_rows
+        }
+
+async def stream_debug_response(soup, content: str, tables: list, page_title: str, rows_data: list, use_playwright: bool):
+    """Serialize the /debug payload piece by piece with orjson.
+    Headers are already sent once this runs, so a failure is reported as an "error" key
+    that still closes the JSON document instead of cutting the body short."""
+    yield b'{"page_title":' + orjson.dumps(page_title)
+    yield b',"tables_found":' + orjson.dumps(len(tables))
+    # tables_found counts <table> elements in the HTML; table_details may instead describe the extracted trade rows
+    table_details_source = "playwright_trade_rows" if rows_data else "html_tables"
+    yield b',"table_details_source":' + orjson.dumps(table_details_source)
+    in_table_details = False
+    try:
+        yield b',"table_details":['
+        in_table_details = True
+        for i, table_entry in enumerate(iter_debug_tables(tables, rows_data)):
+            if i:
+                yield b','
+            yield orjson.dumps(table_entry)
+        in_table_details = False
+        yield b']'
+        
+        # Check for div-based structures
+        other_containers = soup.find_all("div", class_=["trade-list", "trades", "trade-container", "q-tr"])
+        container_info = []
+        for i, container in enumerate(other_containers):
+            items = container.find_all(["div", "li"], recursive=False)
+            container_info.append({
+                "container_index": i,
+                "class": container.get('class', []),
+                "item_count": len(items),
+                "sample_content": clean_text(container.text)[:200]
+            })
+        yield b',"other_containers":' + orjson.dumps(container_info)
+        yield b',"raw_html_snippet":' + orjson.dumps(str(content)[:2000])
+        
+        # Test selectors
+        selector_results = {}
+        for selector in ["tr.q-tr", "tr.trade-row", "tr[class*='trade']", "tbody tr", ".q-tr", ".trade-item", "[data-trade]"]:
+            elements = soup.select(selector)
+            selector_results[selector] = {
+                "count": len(elements),
+                "sample": [clean_text(el.text)[:100] for el in elements[:2]]
+            }
+        yield b',"selector_results":' + orjson.dumps(selector_results)
+        yield b',"source":' + orjson.dumps("playwright_async" if use_playwright else "requests") + b'}'
+    except Exception as e:
+        logger.error(f"Debug error: {str(e)}")
+        yield (b']' if in_table_details else b'') + b',"error":' + orjson.dumps(str(e)) + b'}'
+
 @app.get("/debug")
 async def debug_page(
+    request: Request,
     use_playwright: bool = False,
     test_date_range: Optional[str] = None,
     test_trade_type: Optional[str] = None,
@@ -313,82 +643,25 @@ async def debug_page(
         
         if use_playwright:
             logger.info("Using Playwright Async for debug...")
-            content, rows_data = await fetch_page_content(base_url, params)
+            content, rows_data = await fetch_page_content(request.app, base_url, params, capture_html=True)
         else:
             response = requests.get(base_url, params=params, headers=headers, timeout=30)
             response.raise_for_status()
             content = response.text
             rows_data = []
-            soup = BeautifulSoup(content, "html.parser")
-            for row in soup.select("tbody tr"):
-                cells = row.find_all("td")
-                rows_data.append({
-                    "cell_count": len(cells),
-                    "cell_contents": [clean_text(cell.text)[:100] for cell in cells],
-                    "description": "",
-                    "raw_html": str(row)[:200]
-                })
         
-        soup = BeautifulSoup(content, "html.parser")
+        soup = BeautifulSoup(content, "lxml")
         
-        # Find all tables
+        # Find all tables (done before streaming so failures here still get the plain error response)
         tables = soup.find_all("table")
-        table_info = []
+        page_title = soup.title.text if soup.title else "No title"
         
-        for i, table in enumerate(tables):
-            rows = table.find_all("tr")
-            sample_rows = []
-            for j, row in enumerate(rows):
-                cells = row.find_all("td")
-                trade_date = clean_text(cells[3].text) if len(cells) > 3 else ""
-                trade_date_dt = parse_date(trade_date) if trade_date else None
-                description = rows_data[j]["description"] if j < len(rows_data) and use_playwright else ""
-                sample_rows.append({
-                    "row_index": j,
-                    "classes": row.get('class', []),
-                    "cell_count": len(cells),
-                    "cell_contents": [clean_text(cell.text)[:100] for cell in cells],
-                    "trade_date": trade_date,
-                    "trade_date_parsed": trade_date_dt.isoformat() if trade_date_dt else "None",
-                    "description": description,
-                    "raw_html": str(row)[:200]
-                })
-            table_info.append({
-                "table_index": i,
-                "row_count": len(rows),
-                "sample_rows": sample_rows
-            })
-        
-        # Check for div-based structures
-        other_containers = soup.find_all("div", class_=["trade-list", "trades", "trade-container", "q-tr"])
-        container_info = []
-        for i, container in enumerate(other_containers):
-            items = container.find_all(["div", "li"], recursive=False)
-            container_info.append({
-                "container_index": i,
-                "class": container.get('class', []),
-                "item_count": len(items),
-                "sample_content": clean_text(container.text)[:200]
-            })
-        
-        # Test selectors
-        selector_results = {}
-        for selector in ["tr.q-tr", "tr.trade-row", "tr[class*='trade']", "tbody tr", ".q-tr", ".trade-item", "[data-trade]"]:
-            elements = soup.select(selector)
-            selector_results[selector] = {
-                "count": len(elements),
-                "sample": [clean_text(el.text)[:100] for el in elements[:2]]
-            }
-        
-        return {
-            "page_title": soup.title.text if soup.title else "No title",
-            "tables_found": len(tables),
-            "table_details": table_info,
-            "other_containers": container_info,
-            "raw_html_snippet": str(content)[:2000],
-            "selector_results": selector_results,
-            "source": "playwright_async" if use_playwright else "requests"
-        }
+        # Stream the response so the full JSON body is never built as one string; the page,
+        # soup and extracted rows are still held until the stream finishes
+        return StreamingResponse(
+            stream_debug_response(soup, content, tables, page_title, rows_data, use_playwright),
+            media_type="application/json"
+        )
         
     except Exception as e:
         logger.error(f"Debug error: {str(e)}")